@@ -0,0 +1,97 @@
+import json
+from typing import Iterable, Iterator, Tuple, Dict, Any
+
+from extractor import InvoiceExtractor
+from validator import InvoiceValidator
+
+
+def stream_extract_and_validate(
+    pdfs: Iterable[Tuple[str, str]],
+    extractor: InvoiceExtractor = None,
+    validator: InvoiceValidator = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Extract + validate PDFs one by one, yielding a record per file as soon
+    as it is done, followed by a final summary record.
+
+    `pdfs` yields (file_name, pdf_path) pairs.
+
+    Records:
+      {"type": "invoice", "index": i, "file": ..., "extracted": {...}, "validation": {...}}
+      {"type": "extraction_error", "file": ..., "error": "..."}
+      {"type": "validation_error", "file": ..., "error": "..."}
+      {"type": "summary", "summary": {...}, "batch_errors": {index: [...]},
+       "extraction_errors": [...]}
+
+    Batch anomalies need the whole batch, so they are only known at the end:
+    `batch_errors` maps invoice index -> extra errors for invoices already sent.
+    Failures are reported as records so the stream always ends with a summary;
+    `summary["failed_files"]` counts files that produced no invoice.
+    """
+    extractor = extractor or InvoiceExtractor()
+    validator = validator or InvoiceValidator()
+
+    invoices = []
+    results = []
+    failed_files = []
+    seen_combinations = set()  # For duplicate detection across the stream
+
+    for file_name, pdf_path in pdfs:
+        try:
+            data = extractor.extract_from_pdf(pdf_path)
+        except Exception as e:
+            failed_files.append(f"{file_name}: {e}")
+            yield {"type": "extraction_error", "file": file_name, "error": failed_files[-1]}
+            continue
+
+        try:
+            result = validator.validate_single(data, seen_combinations)
+        except Exception as e:
+            failed_files.append(f"{file_name}: validation failed: {e}")
+            yield {"type": "validation_error", "file": file_name, "error": failed_files[-1]}
+            continue
+
+        invoices.append(data)
+        results.append(result)
+
+        # Yield a copy: batch anomalies are added to `result` later, and records
+        # already handed out must not change after the fact
+        yield {
+            "type": "invoice",
+            "index": len(results) - 1,
+            "file": file_name,
+            "extracted": data,
+            "validation": dict(result, errors=list(result["errors"])),
+        }
+
+    # Batch-level anomalies over everything that was extracted
+    batch_errors = {}
+    try:
+        all_batch_errors = validator.check_batch_anomalies(invoices)
+    except Exception as e:
+        all_batch_errors = {}
+        yield {"type": "validation_error", "file": None, "error": f"batch anomaly checks failed: {e}"}
+
+    for i, extra_errors in all_batch_errors.items():
+        results[i]["errors"] += extra_errors
+        results[i]["is_valid"] = False
+        batch_errors[i] = extra_errors
+
+    summary = validator.summarize(results)
+    summary["failed_files"] = len(failed_files)
+
+    yield {
+        "type": "summary",
+        "summary": summary,
+        "batch_errors": batch_errors,
+        "extraction_errors": failed_files,
+    }
+
+
+def to_ndjson(records: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """
+    Serialize records as NDJSON lines, e.g. for a FastAPI StreamingResponse
+    with media_type="application/x-ndjson".
+    """
+    for record in records:
+        yield json.dumps(record) + "\n"
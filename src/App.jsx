@@ -5,6 +5,14 @@ import InvoiceCard from "./components/InvoiceCard";
 function App() {
   const [resultData, setResultData] = useState(null);
 
+  // While streaming, the final summary is not there yet: count what has arrived
+  const summary = resultData && (resultData.validation.summary || {
+    total_invoices: resultData.validation.invoices.length,
+    valid_invoices: resultData.validation.invoices.filter(inv => inv.is_valid).length,
+    invalid_invoices: resultData.validation.invoices.filter(inv => !inv.is_valid).length,
+    failed_files: resultData.extracted.filter(item => item.error).length,
+  });
+
   return (
     <div className="container">
       <h1>Invoice QC Console</h1>
@@ -31,17 +39,23 @@ function App() {
 
           <div className="summary-card">
             <div className="summary-item">
-              <strong>{resultData.validation.summary.total_invoices}</strong>
+              <strong>{summary.total_invoices}</strong>
               <span>Total Invoices</span>
             </div>
             <div className="summary-item">
-              <strong style={{color: '#22543d'}}>{resultData.validation.summary.valid_invoices}</strong>
+              <strong style={{color: '#22543d'}}>{summary.valid_invoices}</strong>
               <span>Valid Invoices</span>
             </div>
             <div className="summary-item">
-              <strong style={{color: '#742a2a'}}>{resultData.validation.summary.invalid_invoices}</strong>
+              <strong style={{color: '#742a2a'}}>{summary.invalid_invoices}</strong>
               <span>Invalid Invoices</span>
             </div>
+            {summary.failed_files !== undefined && (
+              <div className="summary-item">
+                <strong style={{color: '#742a2a'}}>{summary.failed_files}</strong>
+                <span>Failed Files</span>
+              </div>
+            )}
           </div>
 
           {resultData.validation.extraction_errors && (
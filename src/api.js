@@ -1,5 +1,9 @@
 export const API_BASE = "http://127.0.0.1:8000";
 
+// The NDJSON streaming route (/extract-and-validate-pdfs/stream) is opt-in:
+// enable with VITE_USE_STREAMING=true once the backend serves it.
+export const USE_STREAMING = import.meta.env.VITE_USE_STREAMING === "true";
+
 export async function uploadPDFs(files) {
     const formData = new FormData();
     for (let file of files) {
@@ -17,3 +21,53 @@ export async function uploadPDFs(files) {
 
     return response.json();
 }
+
+// Streaming variant: the backend sends one NDJSON record per invoice as soon as
+// it is extracted + validated, then a final summary record.
+export async function streamPDFs(files, onRecord) {
+    const formData = new FormData();
+    for (let file of files) {
+        formData.append("files", file);
+    }
+
+    const response = await fetch(`${API_BASE}/extract-and-validate-pdfs/stream`, {
+        method: "POST",
+        body: formData,
+    });
+
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    let gotSummary = false;
+
+    // The summary is always the last record; without it the stream was cut short
+    const handleLine = (line) => {
+        const record = JSON.parse(line);
+        if (record.type === "summary") gotSummary = true;
+        onRecord(record);
+    };
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split("\n");
+        buffer = lines.pop(); // keep the incomplete last line
+
+        for (let line of lines) {
+            if (line.trim()) handleLine(line);
+        }
+    }
+
+    buffer += decoder.decode();
+    if (buffer.trim()) handleLine(buffer);
+
+    if (!gotSummary) {
+        throw new Error("Stream ended before the summary was received");
+    }
+}
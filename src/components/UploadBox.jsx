@@ -1,5 +1,43 @@
 import React, { useState } from "react";
-import { uploadPDFs } from "../api";
+import { uploadPDFs, streamPDFs, USE_STREAMING } from "../api";
+
+// Merge one streamed NDJSON record into the result shape App renders
+function applyRecord(prev, record) {
+    if (record.type === "invoice") {
+        return {
+            extracted: [...prev.extracted, record.extracted],
+            validation: {
+                ...prev.validation,
+                invoices: [...prev.validation.invoices, record.validation],
+            },
+        };
+    }
+
+    if (record.type === "extraction_error" || record.type === "validation_error") {
+        return { ...prev, extracted: [...prev.extracted, { error: record.error }] };
+    }
+
+    if (record.type === "summary") {
+        // Batch anomalies are only known once the whole batch is in
+        const invoices = prev.validation.invoices.map((inv, idx) => {
+            const extra = record.batch_errors[idx];
+            return extra ? { ...inv, is_valid: false, errors: [...inv.errors, ...extra] } : inv;
+        });
+        return {
+            ...prev,
+            validation: {
+                invoices,
+                summary: record.summary,
+                // Same shape as the non-streaming endpoint: only set when nothing could be extracted
+                ...(invoices.length === 0 && record.extraction_errors.length > 0
+                    ? { extraction_errors: record.extraction_errors }
+                    : {}),
+            },
+        };
+    }
+
+    return prev;
+}
 
 export default function UploadBox({ setResultData }) {
     const [selectedFiles, setSelectedFiles] = useState([]);
@@ -13,8 +51,16 @@ export default function UploadBox({ setResultData }) {
 
         setIsLoading(true);
         try {
-            const result = await uploadPDFs(selectedFiles);
-            setResultData(result);
+            if (USE_STREAMING) {
+                // Start empty and fill in as records stream in
+                setResultData({ extracted: [], validation: { invoices: [], summary: null } });
+                await streamPDFs(selectedFiles, (record) => {
+                    setResultData((prev) => applyRecord(prev, record));
+                });
+            } else {
+                const result = await uploadPDFs(selectedFiles);
+                setResultData(result);
+            }
         } catch (error) {
             alert("Error uploading files: " + error.message);
         } finally {
@@ -32,7 +78,7 @@ export default function UploadBox({ setResultData }) {
                 onChange={(e) => setSelectedFiles(Array.from(e.target.files || []))}
             />
             <button onClick={handleSubmit} disabled={isLoading}>
-                {isLoading ? "Uploading..." : "Submit"}
+                {isLoading ? "Processing..." : "Submit"}
             </button>
         </div>
     );
@@ -0,0 +1,108 @@
+import json
+
+from pipeline import stream_extract_and_validate, to_ndjson
+
+
+def make_invoice(order_number, gross_total=119.0, seller_name="ABC Corporation"):
+    return {
+        "order_number": order_number,
+        "invoice_date": "01.01.2024",
+        "seller_name": seller_name,
+        "buyer_name": "Buyer GmbH",
+        "net_total": round(gross_total / 1.19, 2),
+        "tax_amount": round(gross_total - round(gross_total / 1.19, 2), 2),
+        "gross_total": gross_total,
+        "currency": "EUR",
+        "line_items": [],
+    }
+
+
+class StubExtractor:
+    """Returns canned invoices by path; raises for paths missing from `invoices`."""
+
+    def __init__(self, invoices):
+        self.invoices = invoices
+
+    def extract_from_pdf(self, pdf_path):
+        if pdf_path not in self.invoices:
+            raise ValueError("PDF appears to be empty or could not extract text")
+        return self.invoices[pdf_path]
+
+
+def run(files, invoices):
+    return list(stream_extract_and_validate(files, extractor=StubExtractor(invoices)))
+
+
+def test_one_invoice_record_per_successful_file():
+    records = run(
+        [("a.pdf", "a"), ("broken.pdf", "broken"), ("b.pdf", "b")],
+        {"a": make_invoice("1"), "b": make_invoice("2")},
+    )
+
+    invoice_records = [r for r in records if r["type"] == "invoice"]
+    assert [r["file"] for r in invoice_records] == ["a.pdf", "b.pdf"]
+    # index counts successful invoices only
+    assert [r["index"] for r in invoice_records] == [0, 1]
+    assert invoice_records[1]["extracted"]["order_number"] == "2"
+
+
+def test_failed_files_produce_error_records():
+    bad_totals = make_invoice("2")
+    bad_totals["net_total"] = "abc"
+
+    records = run(
+        [("broken.pdf", "broken"), ("bad.pdf", "bad")],
+        {"bad": bad_totals},
+    )
+
+    assert records[0]["type"] == "extraction_error"
+    assert records[0]["file"] == "broken.pdf"
+    assert records[1]["type"] == "validation_error"
+    assert records[1]["file"] == "bad.pdf"
+
+
+def test_summary_is_last_with_failed_files_and_batch_errors():
+    invoices = {str(i): make_invoice(str(i)) for i in range(5)}
+    invoices["5"] = make_invoice("5", gross_total=5000.0)
+    files = [(f"{i}.pdf", str(i)) for i in range(6)] + [("broken.pdf", "broken")]
+
+    records = run(files, invoices)
+
+    summary = records[-1]
+    assert summary["type"] == "summary"
+    assert all(r["type"] != "summary" for r in records[:-1])
+    assert summary["summary"]["total_invoices"] == 6
+    assert summary["summary"]["failed_files"] == 1
+    assert summary["extraction_errors"] == ["broken.pdf: PDF appears to be empty or could not extract text"]
+    assert summary["batch_errors"] == {5: ["batch_anomaly: seller_gross_total_outlier"]}
+    assert summary["summary"]["error_counts"]["batch_anomaly: seller_gross_total_outlier"] == 1
+
+
+def test_invoice_records_are_not_changed_by_batch_errors():
+    invoices = {str(i): make_invoice(str(i)) for i in range(5)}
+    invoices["5"] = make_invoice("5", gross_total=5000.0)
+
+    records = run([(f"{i}.pdf", str(i)) for i in range(6)], invoices)
+
+    assert records[5]["type"] == "invoice"
+    assert not any(e.startswith("batch_anomaly") for e in records[5]["validation"]["errors"])
+
+
+def test_duplicates_detected_across_the_stream():
+    records = run(
+        [("a.pdf", "a"), ("a-copy.pdf", "a")],
+        {"a": make_invoice("1")},
+    )
+
+    assert "anomaly: duplicate_invoice" not in records[0]["validation"]["errors"]
+    assert "anomaly: duplicate_invoice" in records[1]["validation"]["errors"]
+
+
+def test_to_ndjson_writes_one_object_per_line():
+    records = run([("a.pdf", "a"), ("broken.pdf", "broken")], {"a": make_invoice("1")})
+
+    lines = list(to_ndjson(records))
+
+    assert len(lines) == len(records)
+    assert all(line.endswith("\n") and line.count("\n") == 1 for line in lines)
+    assert [json.loads(line)["type"] for line in lines] == ["invoice", "extraction_error", "summary"]
@@ -0,0 +1,122 @@
+from validator import InvoiceValidator
+
+
+def make_invoice(i, gross_total, unit_price=10.0, seller_name="ABC Corporation"):
+    net_total = round(gross_total / 1.19, 2)
+    return {
+        "order_number": str(i),
+        "invoice_date": f"{i + 1:02d}.01.2024",
+        "seller_name": seller_name,
+        "buyer_name": "Buyer GmbH",
+        "net_total": net_total,
+        "tax_amount": round(gross_total - net_total, 2),
+        "gross_total": gross_total,
+        "currency": "EUR",
+        "line_items": [{"description": "Widget", "quantity": 1, "unit_price": unit_price, "line_total": unit_price}],
+    }
+
+
+def test_zero_iqr_group_does_not_flag_small_deviation():
+    invoices = [make_invoice(i, 100.0) for i in range(4)] + [make_invoice(4, 100.01)]
+    errors = InvoiceValidator().check_batch_anomalies(invoices)
+    assert not any("batch_anomaly: seller_gross_total_outlier" in e for e in errors.values())
+
+
+def test_catalog_price_change_does_not_flag_unit_price():
+    invoices = [make_invoice(i, 100.0, unit_price=10.0) for i in range(6)]
+    invoices += [make_invoice(i, 100.0, unit_price=10.5) for i in range(6, 8)]
+    errors = InvoiceValidator().check_batch_anomalies(invoices)
+    assert not any("batch_anomaly: unit_price_outlier" in e for e in errors.values())
+
+
+def test_real_outlier_is_still_flagged():
+    invoices = [make_invoice(i, 100.0) for i in range(5)] + [make_invoice(5, 5000.0)]
+    errors = InvoiceValidator().check_batch_anomalies(invoices)
+    assert errors == {5: ["batch_anomaly: seller_gross_total_outlier"]}
+
+
+def test_seller_names_grouped_ignoring_case_and_whitespace():
+    names = ["ABC Corporation", "abc corporation ", " ABC  CORPORATION", "ABC corporation", "Abc Corporation"]
+    invoices = [make_invoice(i, 100.0, seller_name=name) for i, name in enumerate(names)]
+    invoices.append(make_invoice(5, 5000.0, seller_name="ABC corporation "))
+    errors = InvoiceValidator().check_batch_anomalies(invoices)
+    assert "batch_anomaly: seller_gross_total_outlier" in errors[5]
+
+
+def test_mixed_vat_rates_are_not_inconsistent():
+    invoice = make_invoice(0, 113.0)
+    invoice["net_total"], invoice["tax_amount"] = 100.0, 13.0
+    errors = InvoiceValidator().check_batch_anomalies([invoice])
+    assert errors == {}
+
+
+def test_tax_above_max_vat_rate_is_inconsistent():
+    invoice = make_invoice(0, 130.0)
+    invoice["net_total"], invoice["tax_amount"] = 100.0, 30.0
+    errors = InvoiceValidator().check_batch_anomalies([invoice])
+    assert errors == {0: ["batch_anomaly: tax_rate_inconsistent"]}
+
+
+def test_negative_tax_is_left_to_check_format():
+    invoice = make_invoice(0, 95.0)
+    invoice["net_total"], invoice["tax_amount"] = 100.0, -5.0
+    errors = InvoiceValidator().check_batch_anomalies([invoice])
+    assert errors == {}
+
+
+def with_items(invoice, count):
+    invoice["line_items"] = invoice["line_items"] * count
+    return invoice
+
+
+def test_line_item_count_jump_is_flagged():
+    invoices = [with_items(make_invoice(0, 100.0), 1), with_items(make_invoice(1, 100.0), 10)]
+    errors = InvoiceValidator().check_batch_anomalies(invoices)
+    assert errors == {1: ["batch_anomaly: line_item_count_jump"]}
+
+
+def test_line_item_count_jump_follows_invoice_date():
+    # The 10-item invoice is dated before the 1-item one, so there is no jump
+    invoices = [with_items(make_invoice(1, 100.0), 1), with_items(make_invoice(0, 100.0), 10)]
+    errors = InvoiceValidator().check_batch_anomalies(invoices)
+    assert errors == {}
+
+
+def test_line_item_count_jump_below_min_jump_is_not_flagged():
+    # 1 -> 4 items is a 4x jump but fewer than LINE_COUNT_MIN_JUMP extra items
+    invoices = [with_items(make_invoice(0, 100.0), 1), with_items(make_invoice(1, 100.0), 4)]
+    errors = InvoiceValidator().check_batch_anomalies(invoices)
+    assert errors == {}
+
+
+def test_line_item_count_jump_across_sellers_is_not_flagged():
+    invoices = [
+        with_items(make_invoice(0, 100.0, seller_name="ABC Corporation"), 1),
+        with_items(make_invoice(1, 100.0, seller_name="XYZ GmbH"), 10),
+    ]
+    errors = InvoiceValidator().check_batch_anomalies(invoices)
+    assert errors == {}
+
+
+def test_unit_price_outlier_is_reported_on_owning_invoice():
+    invoices = [make_invoice(i, 100.0) for i in range(6)]
+    # The outlier is the second line item of invoice 3
+    invoices[3]["line_items"] = [
+        {"description": "Gadget", "quantity": 1, "unit_price": 5.0, "line_total": 5.0},
+        {"description": "  widget", "quantity": 1, "unit_price": 1000.0, "line_total": 1000.0},
+    ]
+    errors = InvoiceValidator().check_batch_anomalies(invoices)
+    assert errors == {3: ["batch_anomaly: unit_price_outlier"]}
+
+
+def test_validate_invoices_counts_batch_anomalies_in_summary():
+    invoices = [make_invoice(i, 100.0) for i in range(5)] + [make_invoice(5, 5000.0)]
+    invoices[0]["net_total"], invoices[0]["tax_amount"] = 80.0, 20.0
+
+    report = InvoiceValidator().validate_invoices(invoices)
+
+    error_counts = report["summary"]["error_counts"]
+    assert error_counts["batch_anomaly: seller_gross_total_outlier"] == 1
+    assert error_counts["batch_anomaly: tax_rate_inconsistent"] == 1
+    assert "batch_anomaly: seller_gross_total_outlier" in report["invoices"][5]["errors"]
+    assert report["invoices"][5]["is_valid"] is False
@@ -2,6 +2,105 @@ from typing import List, Dict, Any, Tuple
 from datetime import datetime
 import re
 
+import numpy as np
+
+
+# Batch anomaly thresholds
+BATCH_MIN_GROUP_SIZE = 5        # groups smaller than this are not checked for outliers
+BATCH_IQR_FACTOR = 3.0          # values outside Q1/Q3 -/+ factor * spread are outliers
+BATCH_MIN_SPREAD_REL = 0.1      # spread is at least this fraction of the group median (IQR is often 0)
+BATCH_MIN_SPREAD_ABS = 0.01     # ... and never below one cent
+MAX_VAT_RATE = 0.19             # highest German VAT rate; mixed 7%/19% invoices land in between
+TAX_TOLERANCE = 0.05            # allowed rounding difference on tax_amount
+LINE_COUNT_JUMP_FACTOR = 3.0    # line item count grew by at least this factor ...
+LINE_COUNT_MIN_JUMP = 5         # ... and by at least this many items vs. the seller's previous invoice
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return np.nan
+
+
+def _float_column(values: list) -> np.ndarray:
+    # Fast path for numbers/None (-> NaN); per-value fallback only if something is not numeric
+    try:
+        return np.array(values, dtype=float)
+    except (ValueError, TypeError):
+        return np.array([_to_float(v) for v in values], dtype=float)
+
+
+def _normalize_key(value):
+    # Case- and whitespace-insensitive grouping key, "" if missing
+    return " ".join(str(value or "").lower().split())
+
+
+def _date_key(value):
+    # DD.MM.YYYY -> YYYYMMDD so that keys sort chronologically, "" if unparseable
+    if isinstance(value, str) and len(value) == 10 and value[2] == "." and value[5] == ".":
+        return value[6:] + value[3:5] + value[:2]
+    return ""
+
+
+def _group_codes(values: list, key) -> np.ndarray:
+    """
+    Integer group codes for `values` after mapping them through `key`; codes
+    follow the sort order of the keys, -1 where the key is "".
+    `key` runs once per distinct raw value, not once per element.
+    """
+    # Factorize with a dict: much cheaper than sorting millions of strings
+    distinct = {}
+    inverse = np.array([distinct.setdefault(v, len(distinct)) for v in values], dtype=np.int64)
+    keys = np.array([key(v) for v in distinct], dtype=str)
+    _, codes = np.unique(keys, return_inverse=True)
+    codes = np.where(keys == "", -1, codes)
+    return codes[inverse]
+
+
+def _group_outliers(groups: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    Flag values lying outside the IQR fences of their group.
+    `groups` holds integer group codes (-1 = no group), `values` may contain NaN.
+    """
+    flags = np.zeros(len(values), dtype=bool)
+    idx = np.flatnonzero((groups >= 0) & ~np.isnan(values))
+    if len(idx) == 0:
+        return flags
+
+    # Sort by group, then value, so every group is a contiguous sorted run
+    # (value argsort + stable sort on the integer codes beats np.lexsort here)
+    idx = idx[np.argsort(values[idx])]
+    idx = idx[np.argsort(groups[idx], kind="stable")]
+    sorted_values = values[idx]
+    _, starts, counts = np.unique(groups[idx], return_index=True, return_counts=True)
+
+    def quantile(q):
+        # Linear interpolation inside each group's run (same as np.percentile)
+        pos = starts + (counts - 1) * q
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.ceil(pos).astype(np.int64)
+        return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+    q1 = quantile(0.25)
+    median = quantile(0.5)
+    q3 = quantile(0.75)
+
+    # Floor the spread: when most values in a group are equal (e.g. a catalog
+    # price) the IQR is 0 and every other value would be an outlier
+    spread = np.maximum(q3 - q1, BATCH_MIN_SPREAD_REL * np.abs(median))
+    spread = np.maximum(spread, BATCH_MIN_SPREAD_ABS)
+
+    # Broadcast per-group fences back onto the sorted elements
+    group_pos = np.repeat(np.arange(len(counts)), counts)
+    lower = (q1 - BATCH_IQR_FACTOR * spread)[group_pos]
+    upper = (q3 + BATCH_IQR_FACTOR * spread)[group_pos]
+    checked = (counts >= BATCH_MIN_GROUP_SIZE)[group_pos]
+
+    outliers = checked & ((sorted_values < lower) | (sorted_values > upper))
+    flags[idx[outliers]] = True
+    return flags
+
 
 class InvoiceValidator:
 
@@ -10,29 +109,37 @@ class InvoiceValidator:
 
     def validate_invoices(self, invoices: List[Dict[str, Any]]) -> Dict[str, Any]:
         results = []
-        error_counts = {}
         seen_combinations = set()  # For duplicate detection
 
-        for inv in invoices:
+        # Batch-level anomalies need the whole batch, so run them up front
+        batch_errors = self.check_batch_anomalies(invoices)
+
+        for i, inv in enumerate(invoices):
             invoice_result = self.validate_single(inv, seen_combinations)
+            extra_errors = batch_errors.get(i)
+            if extra_errors:
+                invoice_result["errors"] += extra_errors
+                invoice_result["is_valid"] = False
             results.append(invoice_result)
 
-            # Count errors for summary
-            for err in invoice_result["errors"]:
+        return {
+            "invoices": results,
+            "summary": self.summarize(results)
+        }
+
+    def summarize(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        error_counts = {}
+        for r in results:
+            for err in r["errors"]:
                 error_counts[err] = error_counts.get(err, 0) + 1
 
-        summary = {
-            "total_invoices": len(invoices),
+        return {
+            "total_invoices": len(results),
             "valid_invoices": sum(1 for r in results if r["is_valid"]),
             "invalid_invoices": sum(1 for r in results if not r["is_valid"]),
             "error_counts": error_counts
         }
 
-        return {
-            "invoices": results,
-            "summary": summary
-        }
-
     def validate_single(self, inv: Dict[str, Any], seen_combinations: set = None) -> Dict[str, Any]:
         errors = []
 
@@ -198,3 +305,70 @@ class InvoiceValidator:
                     errors.append("anomaly: invalid_discount_format")
 
         return errors
+
+    def check_batch_anomalies(self, invoices: List[Dict[str, Any]]) -> Dict[int, List[str]]:
+        """
+        Statistical anomalies across the whole batch, computed with NumPy
+        group operations. Returns {invoice index: errors} for flagged invoices only.
+        """
+        n = len(invoices)
+        errors = {}
+        if n == 0:
+            return errors
+
+        # Column arrays for the invoices
+        gross = _float_column([inv.get("gross_total") for inv in invoices])
+        net = _float_column([inv.get("net_total") for inv in invoices])
+        tax = _float_column([inv.get("tax_amount") for inv in invoices])
+        seller_codes = _group_codes([inv.get("seller_name") or "" for inv in invoices], _normalize_key)
+        date_codes = _group_codes([inv.get("invoice_date") or "" for inv in invoices], _date_key)
+        item_counts = np.array([len(inv.get("line_items") or []) for inv in invoices], dtype=np.int64)
+
+        flags = {}
+
+        # Rule: gross_total is an outlier among the seller's invoices
+        flags["batch_anomaly: seller_gross_total_outlier"] = _group_outliers(seller_codes, gross)
+
+        # Rule: unit_price is an outlier among line items with the same description
+        line_items = [item for inv in invoices for item in (inv.get("line_items") or [])]
+        if line_items:
+            owners = np.repeat(np.arange(n), item_counts)
+            description_codes = _group_codes(
+                [item.get("description") or "" for item in line_items], _normalize_key
+            )
+            prices = _float_column([item.get("unit_price") for item in line_items])
+
+            item_flags = _group_outliers(description_codes, prices)
+            price_flags = np.zeros(n, dtype=bool)
+            price_flags[owners[item_flags]] = True
+            flags["batch_anomaly: unit_price_outlier"] = price_flags
+
+        # Rule: effective tax rate must not exceed the highest VAT rate
+        # (invoices mixing 7% and 19% lines have a blended rate in between;
+        # negative tax is already reported by check_format)
+        has_amounts = ~np.isnan(net) & ~np.isnan(tax) & (net > 0)
+        too_high = tax > net * MAX_VAT_RATE + TAX_TOLERANCE
+        flags["batch_anomaly: tax_rate_inconsistent"] = has_amounts & too_high
+
+        # Rule: sudden jump in line item count vs. the seller's previous invoice
+        jump_flags = np.zeros(n, dtype=bool)
+        dated = np.flatnonzero((seller_codes >= 0) & (date_codes >= 0))
+        if len(dated) > 1:
+            order = dated[np.lexsort((date_codes[dated], seller_codes[dated]))]
+            same_seller = seller_codes[order[1:]] == seller_codes[order[:-1]]
+            previous = item_counts[order[:-1]]
+            current = item_counts[order[1:]]
+            jumped = (
+                same_seller
+                & (current >= LINE_COUNT_JUMP_FACTOR * np.maximum(previous, 1))
+                & (current - previous >= LINE_COUNT_MIN_JUMP)
+            )
+            jump_flags[order[1:][jumped]] = True
+        flags["batch_anomaly: line_item_count_jump"] = jump_flags
+
+        # Only the flagged invoices are visited here
+        for code, mask in flags.items():
+            for i in np.flatnonzero(mask).tolist():
+                errors.setdefault(i, []).append(code)
+
+        return errors